@@ -11,6 +11,8 @@ from playwright.async_api import async_playwright
 import os
 from datetime import datetime
 
+from lcd_common import CHROMIUM_ARGS
+
 async def download_lcd_policy_as_pdf():
     """
     Downloads a Medicare LCD policy as PDF using Playwright.
@@ -30,27 +32,24 @@ async def download_lcd_policy_as_pdf():
     
     async with async_playwright() as p:
         # Launch browser (use chromium for best PDF rendering)
-        browser = await p.chromium.launch(headless=True)
+        browser = await p.chromium.launch(headless=True, args=CHROMIUM_ARGS)
         page = await browser.new_page()
         
         try:
             print(f"Loading LCD policy from: {lcd_url}")
             
             # Navigate to the LCD policy page
-            await page.goto(lcd_url, wait_until="networkidle")
-            
-            # Wait for initial page load
-            await page.wait_for_timeout(2000)
+            await page.goto(lcd_url, wait_until="domcontentloaded")
             
             # Look for and click "I Accept" button if it exists
             try:
                 print("Looking for 'I Accept' button...")
-                accept_button = await page.wait_for_selector("input[value='I Accept'], button:has-text('I Accept'), input[type='submit'][value*='Accept']", timeout=5000)
+                accept_button = await page.wait_for_selector("input[value='I Accept'], button:has-text('I Accept'), input[type='submit'][value*='Accept']", timeout=2000)
                 if accept_button:
                     print("Found 'I Accept' button, clicking...")
                     await accept_button.click()
                     # Wait for page to load after accepting terms
-                    await page.wait_for_timeout(3000)
+                    await page.wait_for_load_state("domcontentloaded")
                     print("Terms accepted, page loaded")
                 else:
                     print("No 'I Accept' button found, proceeding...")
@@ -58,8 +57,8 @@ async def download_lcd_policy_as_pdf():
                 print(f"No 'I Accept' button found or error clicking: {e}")
                 # Continue anyway in case the button isn't needed
             
-            # Wait for content to fully load
-            await page.wait_for_timeout(2000)
+            # Wait for content (including images and stylesheets) to fully load
+            await page.wait_for_load_state("load")
             
             print("Generating PDF...")
             
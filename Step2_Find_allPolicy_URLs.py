@@ -13,15 +13,117 @@ This script will:
 import asyncio
 from playwright.async_api import async_playwright
 import json
+import os
 import re
 from datetime import datetime
 import time
 
+from lcd_common import CHROMIUM_ARGS, block_unneeded_resources
+
+DOC_ID_RE = re.compile(r'DocID=(L\d+)')
+LCD_URL_RE = re.compile(r'LCDId=(\d+)(?:&DocID=(L\d+))?')
+
+# Maps matched anchors to [href, text] pairs in one call instead of one per element
+LINK_PAIRS_JS = "els => els.map(e => [e.getAttribute('href'), e.innerText])"
+
+# Browser storage state holding the CMS "I Accept" consent cookie
+STATE_FILE = "cms_state.json"
+
 class LCDPolicyFinder:
-    def __init__(self):
+    def __init__(self, cache_file="All_urls.json"):
         self.base_url = "https://www.cms.gov/medicare-coverage-database/search.aspx"
         self.lcd_urls = []
         self.processed_ids = set()
+        self._merge_lock = asyncio.Lock()
+        self._state_lock = asyncio.Lock()  # pages may re-accept the terms at the same time
+        
+        # Every policy found in one run shares the same found_date
+        self.run_timestamp = datetime.now().isoformat()
+        
+        # Seed with LCDs discovered by earlier runs so only new ones are emitted
+        self.load_previous_results(cache_file)
+
+    def load_previous_results(self, filename):
+        """Load previously discovered LCDs from an existing JSON file."""
+        
+        try:
+            with open(filename, 'r', encoding='utf-8') as f:
+                previous = json.load(f)
+        except FileNotFoundError:
+            return
+        except json.JSONDecodeError:
+            print(f"Ignoring unreadable {filename}")
+            return
+        
+        # Estimated entries (from Step2_Manual_LCD_List.py) were never validated
+        self.lcd_urls = [p for p in previous.get("policies", []) if p.get("status") != "estimated"]
+        self.processed_ids = {p["lcd_id"] for p in self.lcd_urls}
+        print(f"Loaded {len(self.lcd_urls)} previously found LCDs from {filename}")
+
+    async def accept_terms(self, browser):
+        """Click "I Accept" once and save the consent cookie for later contexts."""
+        
+        if os.path.exists(STATE_FILE):
+            return
+        
+        context = await browser.new_context()
+        page = await context.new_page()
+        
+        try:
+            await page.goto(self.base_url, wait_until="domcontentloaded", timeout=10000)
+            
+            try:
+                accept_button = await page.wait_for_selector("input[value='I Accept'], button:has-text('I Accept')", timeout=2000)
+            except:
+                accept_button = None  # no gate shown, so the plain state is already enough
+            
+            # A failed click raises here, so no state file is written without consent
+            if accept_button:
+                await accept_button.click()
+                await page.wait_for_load_state("domcontentloaded")
+            
+            await self.save_state(context)
+        except Exception as e:
+            print(f"Could not save consent state: {e}")
+        finally:
+            await context.close()
+
+    async def save_state(self, context):
+        """Write the context's storage state to STATE_FILE without ever leaving it half-written."""
+        
+        async with self._state_lock:
+            temp_file = STATE_FILE + ".tmp"
+            await context.storage_state(path=temp_file)
+            os.replace(temp_file, STATE_FILE)
+
+    async def open_crawl_context(self, browser):
+        """New context starting from the saved consent; an unreadable STATE_FILE is accepted afresh."""
+        
+        try:
+            context = await browser.new_context(storage_state=STATE_FILE if os.path.exists(STATE_FILE) else None)
+        except Exception as e:
+            print(f"Could not load {STATE_FILE} ({e}), accepting the terms again")
+            os.remove(STATE_FILE)
+            await self.accept_terms(browser)
+            context = await browser.new_context(storage_state=STATE_FILE if os.path.exists(STATE_FILE) else None)
+        
+        await context.route("**/*", block_unneeded_resources)
+        return context
+
+    async def ensure_accepted(self, page):
+        """Click through the "I Accept" gate if it shows up again and refresh the saved consent."""
+        
+        accept_button = await page.query_selector("input[value='I Accept']")
+        if not accept_button:
+            return
+        
+        try:
+            await accept_button.click()
+            await page.wait_for_load_state("domcontentloaded")
+            await self.save_state(page.context)
+            print("Re-accepted the CMS terms and refreshed the saved consent")
+        except Exception as e:
+            print(f"Could not re-accept the CMS terms: {e}")
 
     async def search_lcd_policies(self, page, search_term="", page_num=1):
         """Search for LCD policies using the CMS search interface."""
@@ -30,207 +132,180 @@ class LCDPolicyFinder:
             print(f"Searching page {page_num} with term: '{search_term}'")
             
             # Navigate to search page
-            await page.goto(self.base_url, wait_until="networkidle")
-            await page.wait_for_timeout(2000)
+            await page.goto(self.base_url, wait_until="domcontentloaded", timeout=10000)
+            await self.ensure_accepted(page)
             
-            # Handle "I Accept" if it appears
-            try:
-                accept_button = await page.wait_for_selector("input[value='I Accept'], button:has-text('I Accept')", timeout=3000)
-                if accept_button:
-                    await accept_button.click()
-                    await page.wait_for_timeout(2000)
-            except:
-                pass
+            # Check which form controls exist in one DOM snapshot, so missing
+            # elements don't each burn a full wait_for_selector timeout
+            present = await page.evaluate("""() => ({
+                lcd: !!document.querySelector("input[value='LCD']"),
+                search: !!document.querySelector("input[name*='search'], input[id*='search']"),
+                submit: !!document.querySelector("input[type='submit'], button[type='submit']")
+            })""")
             
             # Select LCD document type
-            try:
-                lcd_checkbox = await page.wait_for_selector("input[value='LCD']", timeout=5000)
-                if lcd_checkbox:
+            if present['lcd']:
+                try:
+                    lcd_checkbox = await page.wait_for_selector("input[value='LCD']", timeout=1500)
                     await lcd_checkbox.check()
                     print("Selected LCD document type")
-            except Exception as e:
-                print(f"Could not find LCD checkbox: {e}")
+                except Exception as e:
+                    print(f"Could not select LCD checkbox: {e}")
+            else:
+                print("Could not find LCD checkbox")
             
             # Enter search term if provided
-            if search_term:
+            if search_term and present['search']:
                 try:
-                    search_input = await page.wait_for_selector("input[name*='search'], input[id*='search']", timeout=5000)
-                    if search_input:
-                        await search_input.fill(search_term)
+                    search_input = await page.wait_for_selector("input[name*='search'], input[id*='search']", timeout=1500)
+                    await search_input.fill(search_term)
                 except:
                     pass
             
             # Click search button
-            try:
-                search_button = await page.wait_for_selector("input[type='submit'], button[type='submit']", timeout=5000)
-                if search_button:
-                    await search_button.click()
-                    await page.wait_for_timeout(3000)
+            if present['submit']:
+                try:
+                    search_button = await page.wait_for_selector("input[type='submit'], button[type='submit']", timeout=1500)
+                    async with page.expect_navigation(wait_until="domcontentloaded", timeout=10000):
+                        await search_button.click()
                     print("Search submitted")
-            except Exception as e:
-                print(f"Could not find search button: {e}")
+                except Exception as e:
+                    print(f"Could not submit search: {e}")
+            else:
+                print("Could not find search button")
             
-            # Extract LCD links from results
-            await self.extract_lcd_links(page)
+            # Extract LCD links from every results page
+            await self.scan_result_page(page, paginate=True)
             
         except Exception as e:
             print(f"Error in search: {e}")
 
     async def extract_lcd_links(self, page):
-        """Extract all LCD policy links from the current page."""
+        """Extract all LCD policy links from the current page.
+        
+        Returns (policies, lcd_ids, page_ids): the links not yet seen, which
+        callers merge into the shared results with merge_lcd_links, and every
+        LCD ID linked from the page, seen or not.
+        """
+        
+        local_urls = []
+        local_ids = set()
+        page_ids = set()
         
         try:
-            # Wait for results to load
-            await page.wait_for_timeout(3000)
+            # Wait for results to load; pages without LCD links simply yield nothing
+            try:
+                await page.wait_for_selector("a[href*='lcd.aspx']", timeout=8000)
+            except Exception:
+                pass
             
-            # Look for LCD links in various possible formats
-            lcd_link_selectors = [
-                "a[href*='lcd.aspx']",
-                "a[href*='LCDId=']",
-                "a[href*='DocID=L']",
-                "a:has-text('L')"
-            ]
+            # Pull every LCD link's href and text in a single round-trip
+            links = await page.locator("a[href*='lcd.aspx']").evaluate_all(LINK_PAIRS_JS)
             
-            for selector in lcd_link_selectors:
-                try:
-                    links = await page.query_selector_all(selector)
-                    for link in links:
-                        href = await link.get_attribute('href')
-                        text = await link.inner_text()
+            for href, text in links:
+                if href and 'LCDId=' in href:
+                    # Extract LCD ID and Doc ID in one match; DocID usually follows LCDId
+                    match = LCD_URL_RE.search(href)
+                    doc_id_match = None if not match or match.group(2) else DOC_ID_RE.search(href)
+                    
+                    if match and (match.group(2) or doc_id_match):
+                        lcd_id = match.group(1)
+                        doc_id = match.group(2) or doc_id_match.group(1)
+                        page_ids.add(lcd_id)
                         
-                        if href and 'lcd.aspx' in href and 'LCDId=' in href:
-                            # Extract LCD ID
-                            lcd_id_match = re.search(r'LCDId=(\d+)', href)
-                            doc_id_match = re.search(r'DocID=(L\d+)', href)
+                        if lcd_id not in local_ids and lcd_id not in self.processed_ids:
+                            full_url = href if href.startswith('http') else f"https://www.cms.gov{href}"
                             
-                            if lcd_id_match and doc_id_match:
-                                lcd_id = lcd_id_match.group(1)
-                                doc_id = doc_id_match.group(1)
-                                
-                                if lcd_id not in self.processed_ids:
-                                    full_url = href if href.startswith('http') else f"https://www.cms.gov{href}"
-                                    
-                                    policy_info = {
-                                        "lcd_id": lcd_id,
-                                        "doc_id": doc_id,
-                                        "title": text.strip() if text else f"LCD Policy {doc_id}",
-                                        "url": full_url,
-                                        "found_date": datetime.now().isoformat()
-                                    }
-                                    
-                                    self.lcd_urls.append(policy_info)
-                                    self.processed_ids.add(lcd_id)
-                                    print(f"Found LCD {doc_id}: {text.strip()[:50]}...")
-                
-                except Exception as e:
-                    continue
-            
-            print(f"Total unique LCDs found so far: {len(self.lcd_urls)}")
+                            policy_info = {
+                                "lcd_id": lcd_id,
+                                "doc_id": doc_id,
+                                "title": text.strip() if text else f"LCD Policy {doc_id}",
+                                "url": full_url,
+                                "found_date": self.run_timestamp
+                            }
+                            
+                            local_urls.append(policy_info)
+                            local_ids.add(lcd_id)
+                            print(f"Found LCD {doc_id}: {text.strip()[:50]}...")
             
         except Exception as e:
             print(f"Error extracting links: {e}")
+        
+        return local_urls, local_ids, page_ids
 
-    async def extract_all_lcd_results(self, page):
-        """Extract all LCD results from search results page with pagination."""
+    async def merge_lcd_links(self, new_urls, new_ids):
+        """Merge links found by one coroutine into the shared results."""
+        
+        async with self._merge_lock:
+            # Another search may have found some of these while we were extracting
+            self.lcd_urls.extend(p for p in new_urls if p['lcd_id'] not in self.processed_ids)
+            self.processed_ids |= new_ids
+        
+        print(f"Total unique LCDs found so far: {len(self.lcd_urls)}")
+
+    async def scan_result_page(self, page, paginate=False, max_pages=50):
+        """Collect LCD links from the current page, optionally following "Next" pages."""
         
         page_num = 1
-        max_pages = 50  # Safety limit
+        previous_ids = None
         
-        while page_num <= max_pages:
+        while True:
+            new_urls, new_ids, page_ids = await self.extract_lcd_links(page)
+            await self.merge_lcd_links(new_urls, new_ids)
+            
+            # Pagination is exhausted once a page has no LCD links or repeats the
+            # previous page ("Next" on the last page reloads it). Pages of LCDs
+            # already known from earlier runs still lead on to newer ones.
+            if not paginate or not page_ids or page_ids == previous_ids or page_num >= max_pages:
+                break
+            previous_ids = page_ids
+            
             try:
-                print(f"Processing results page {page_num}...")
-                
-                # Wait for results to load
-                await page.wait_for_timeout(3000)
-                
-                # Extract LCD links from current page
-                initial_count = len(self.lcd_urls)
-                
-                # Look for result links in table or list format
-                result_selectors = [
-                    "a[href*='lcd.aspx?LCDId=']",
-                    "table a[href*='LCDId=']",
-                    ".searchResults a[href*='lcd.aspx']",
-                    "tr a[href*='LCDId=']"
-                ]
-                
-                for selector in result_selectors:
-                    try:
-                        links = await page.query_selector_all(selector)
-                        for link in links:
-                            href = await link.get_attribute('href')
-                            text = await link.inner_text()
-                            
-                            if href and 'lcd.aspx' in href and 'LCDId=' in href:
-                                # Extract LCD ID and Doc ID
-                                lcd_id_match = re.search(r'LCDId=(\d+)', href)
-                                doc_id_match = re.search(r'DocID=(L\d+)', href) or re.search(r'(L\d+)', text)
-                                
-                                if lcd_id_match:
-                                    lcd_id = lcd_id_match.group(1)
-                                    doc_id = doc_id_match.group(1) if doc_id_match else f"L{lcd_id}"
-                                    
-                                    if lcd_id not in self.processed_ids:
-                                        full_url = href if href.startswith('http') else f"https://www.cms.gov{href}"
-                                        
-                                        policy_info = {
-                                            "lcd_id": lcd_id,
-                                            "doc_id": doc_id,
-                                            "title": text.strip() if text else f"LCD Policy {doc_id}",
-                                            "url": full_url,
-                                            "found_date": datetime.now().isoformat()
-                                        }
-                                        
-                                        self.lcd_urls.append(policy_info)
-                                        self.processed_ids.add(lcd_id)
-                    except:
-                        continue
-                
-                new_count = len(self.lcd_urls) - initial_count
-                print(f"Found {new_count} new LCD policies on page {page_num}")
-                
-                # Look for next page link
-                try:
-                    next_link = await page.query_selector("a:has-text('Next'), a:has-text('>'), a[title*='Next']")
-                    if next_link and new_count > 0:
-                        await next_link.click()
-                        await page.wait_for_timeout(3000)
-                        page_num += 1
-                    else:
-                        print("No more pages or no new results found")
-                        break
-                except:
-                    print("No next page found")
+                next_link = await page.query_selector("a:has-text('Next'), a:has-text('>'), a[title*='Next']")
+                if not next_link:
                     break
-                    
+                
+                async with page.expect_navigation(wait_until="domcontentloaded", timeout=10000):
+                    await next_link.click()
+                page_num += 1
+                print(f"Processing results page {page_num}...")
             except Exception as e:
                 print(f"Error on page {page_num}: {e}")
                 break
-        
-        print(f"Completed pagination. Total LCDs found: {len(self.lcd_urls)}")
 
     async def comprehensive_search(self):
         """Perform comprehensive search for all LCD policies."""
         
         async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
-            page = await browser.new_page()
+            browser = await p.chromium.launch(headless=True, args=CHROMIUM_ARGS)
             
             try:
+                # Accept the terms once; every context then starts with the consent cookie
+                await self.accept_terms(browser)
+                
+                # Separate contexts for the report scans and the keyword search
+                report_context = await self.open_crawl_context(browser)
+                keyword_context = await self.open_crawl_context(browser)
+                
                 print("🔍 Starting LCD policy search...")
                 
-                # Try multiple approaches to find LCD policies
-                await self.search_via_reports(page)
-                await self.search_via_keyword(page)
-                await self.try_known_lcd_patterns(page)
+                # Try the report and keyword searches at once
+                await asyncio.gather(
+                    self.search_via_reports(report_context),
+                    self.search_via_keyword(await keyword_context.new_page())
+                )
+                
+                # Pattern probing is only a cold-start fallback when nothing else worked
+                if not self.lcd_urls:
+                    await self.try_known_lcd_patterns()
                 
             except Exception as e:
                 print(f"Error in comprehensive search: {e}")
             finally:
                 await browser.close()
 
-    async def search_via_reports(self, page):
-        """Search using LCD report pages."""
+    async def search_via_reports(self, context):
+        """Search using LCD report pages, scanning every report concurrently."""
         
         report_urls = [
             "https://www.cms.gov/medicare-coverage-database/reports/finallcdalphabeticalreport.aspx",
@@ -238,42 +313,31 @@ class LCDPolicyFinder:
             "https://www.cms.gov/medicare-coverage-database/reports/finallcdstatereport.aspx"
         ]
         
-        for url in report_urls:
-            try:
-                print(f"Checking LCD report: {url}")
-                await page.goto(url, wait_until="networkidle")
-                await page.wait_for_timeout(2000)
-                
-                # Handle "I Accept" if needed
-                try:
-                    accept_button = await page.wait_for_selector("input[value='I Accept']", timeout=2000)
-                    if accept_button:
-                        await accept_button.click()
-                        await page.wait_for_timeout(2000)
-                except:
-                    pass
-                
-                # Extract LCD links from report page
-                await self.extract_lcd_links(page)
-                
-            except Exception as e:
-                print(f"Error with report URL {url}: {e}")
+        await asyncio.gather(*[self._scan_report(context, url) for url in report_urls])
+
+    async def _scan_report(self, context, url):
+        """Load a single LCD report page in its own tab and extract its links."""
+        
+        page = await context.new_page()
+        try:
+            print(f"Checking LCD report: {url}")
+            await page.goto(url, wait_until="domcontentloaded", timeout=10000)
+            await self.ensure_accepted(page)
+            
+            # Extract LCD links from report page
+            await self.scan_result_page(page)
+            
+        except Exception as e:
+            print(f"Error with report URL {url}: {e}")
+        finally:
+            await page.close()
 
     async def search_via_keyword(self, page):
         """Search using keyword search."""
         
         try:
-            await page.goto(self.base_url, wait_until="networkidle")
-            await page.wait_for_timeout(2000)
-            
-            # Handle "I Accept" if needed
-            try:
-                accept_button = await page.wait_for_selector("input[value='I Accept']", timeout=2000)
-                if accept_button:
-                    await accept_button.click()
-                    await page.wait_for_timeout(2000)
-            except:
-                pass
+            await page.goto(self.base_url, wait_until="domcontentloaded", timeout=10000)
+            await self.ensure_accepted(page)
             
             # Try to search with LCD keyword
             search_input = await page.query_selector("input[type='text']")
@@ -282,112 +346,78 @@ class LCDPolicyFinder:
                 
                 search_button = await page.query_selector("input[type='submit'], button[type='submit']")
                 if search_button:
-                    await search_button.click()
-                    await page.wait_for_timeout(3000)
-                    await self.extract_lcd_links(page)
+                    async with page.expect_navigation(wait_until="domcontentloaded", timeout=10000):
+                        await search_button.click()
+                    await self.scan_result_page(page, paginate=True)
             
         except Exception as e:
             print(f"Error in keyword search: {e}")
 
-    async def try_known_lcd_patterns(self, page):
+    async def try_known_lcd_patterns(self, concurrency=20):
         """Try to find LCDs using known URL patterns."""
         
+        # Only this cold-start fallback talks HTTP directly, so the crawl itself runs without aiohttp
+        try:
+            import aiohttp
+            from lcd_probe import LCDProber, make_connector
+        except ImportError:
+            print("⚠️ aiohttp not found, skipping pattern probing (pip install aiohttp)")
+            return
+        
         # Generate some known LCD IDs to test the pattern
-        test_lcd_ids = range(30000, 40000, 100)  # Sample range
+        test_lcd_ids = [i for i in range(30000, 40000, 100) if str(i) not in self.processed_ids]  # Sample range
+        
+        # The shared prober reads each page over plain HTTP with retries and rate
+        # limiting; there is no need to render each candidate in the browser
+        prober = LCDProber()
+        prober.run_timestamp = self.run_timestamp  # keep one found_date for the whole run
         
         found_count = 0
-        for lcd_id in test_lcd_ids:
-            if found_count >= 10:  # Limit test to avoid too many requests
-                break
+        async with aiohttp.ClientSession(connector=make_connector(concurrency)) as session:
+            # Probe in batches so we still stop early once enough LCDs are found
+            for start in range(0, len(test_lcd_ids), concurrency):
+                if found_count >= 10:  # Limit test to avoid too many requests
+                    break
                 
-            try:
-                test_url = f"https://www.cms.gov/medicare-coverage-database/view/lcd.aspx?LCDId={lcd_id}"
-                await page.goto(test_url, wait_until="networkidle")
-                await page.wait_for_timeout(1000)
+                batch = test_lcd_ids[start:start + concurrency]
+                results = await asyncio.gather(*[prober.probe(session, lcd_id) for lcd_id in batch], return_exceptions=True)
                 
-                # Check if this is a valid LCD page
-                title = await page.title()
-                if "LCD" in title and "Error" not in title:
-                    # Extract LCD information
-                    try:
-                        content = await page.content()
-                        if "Local Coverage Determination" in content:
-                            policy_info = {
-                                "lcd_id": str(lcd_id),
-                                "doc_id": f"L{lcd_id}",
-                                "title": title,
-                                "url": test_url,
-                                "found_date": datetime.now().isoformat()
-                            }
-                            
-                            if str(lcd_id) not in self.processed_ids:
-                                self.lcd_urls.append(policy_info)
-                                self.processed_ids.add(str(lcd_id))
-                                found_count += 1
-                                print(f"Found valid LCD: L{lcd_id}")
-                    except:
-                        pass
-                        
-            except Exception as e:
-                continue
+                for policy_info in results:
+                    if not isinstance(policy_info, dict) or found_count >= 10:
+                        continue
+                    if policy_info["lcd_id"] not in self.processed_ids:
+                        self.lcd_urls.append(policy_info)
+                        self.processed_ids.add(policy_info["lcd_id"])
+                        found_count += 1
+                        print(f"Found valid LCD: {policy_info['doc_id']}")
         
         print(f"Found {found_count} LCDs via pattern testing")
 
-    async def try_direct_lcd_listings(self, page):
-        """Try to find direct LCD listing pages."""
-        
-        direct_urls = [
-            "https://www.cms.gov/medicare-coverage-database/search.aspx?DocType=LCD",
-            "https://www.cms.gov/medicare-coverage-database/indexes/lcd-index.html"
-        ]
-        
-        for url in direct_urls:
-            try:
-                print(f"Trying direct URL: {url}")
-                await page.goto(url, wait_until="networkidle")
-                await page.wait_for_timeout(3000)
-                
-                # Handle "I Accept" if needed
-                try:
-                    accept_button = await page.wait_for_selector("input[value='I Accept']", timeout=2000)
-                    if accept_button:
-                        await accept_button.click()
-                        await page.wait_for_timeout(2000)
-                except:
-                    pass
-                
-                await self.extract_lcd_links(page)
-                
-            except Exception as e:
-                print(f"Error with direct URL {url}: {e}")
-                continue
-
     def save_to_json(self, filename="All_urls.json"):
         """Save all found LCD URLs to JSON file."""
         
-        # Remove duplicates and sort by LCD ID
-        unique_lcds = []
-        seen_ids = set()
-        
-        for lcd in self.lcd_urls:
-            if lcd['lcd_id'] not in seen_ids:
-                unique_lcds.append(lcd)
-                seen_ids.add(lcd['lcd_id'])
-        
-        # Sort by LCD ID number
-        unique_lcds.sort(key=lambda x: int(x['lcd_id']))
+        # Links are already deduplicated via processed_ids during extraction,
+        # so only sort by LCD ID number
+        self.lcd_urls.sort(key=lambda x: int(x['lcd_id']))
+        unique_lcds = self.lcd_urls
         
-        # Prepare final data structure
-        output_data = {
+        # Prepare header fields; policies are streamed out one compact line each
+        header = {
             "search_date": datetime.now().isoformat(),
             "total_policies": len(unique_lcds),
-            "source": "CMS Medicare Coverage Database",
-            "policies": unique_lcds
+            "source": "CMS Medicare Coverage Database"
         }
         
         # Save to JSON file
         with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(output_data, f, indent=2, ensure_ascii=False)
+            f.write("{\n")
+            for key, value in header.items():
+                f.write(f'  {json.dumps(key)}: {json.dumps(value, ensure_ascii=False)},\n')
+            f.write('  "policies": [')
+            for i, policy in enumerate(unique_lcds):
+                f.write(",\n    " if i else "\n    ")
+                f.write(json.dumps(policy, ensure_ascii=False, separators=(',', ':')))
+            f.write("\n  ]\n}\n" if unique_lcds else "]\n}\n")
         
         print(f"✅ Saved {len(unique_lcds)} unique LCD policies to {filename}")
         return len(unique_lcds)
@@ -6,138 +6,152 @@ and validating them systematically.
 
 import asyncio
 from playwright.async_api import async_playwright
+import aiohttp
 import json
-import re
+import os
 from datetime import datetime
 
+from lcd_common import dumps_line, write_json
+from lcd_probe import LCDProber, candidate_ids, make_connector, warm_up
+
+# Valid LCDs cluster, so the ID space is sampled coarsely and then searched
+# outward from every hit in doubling steps (1, 2, 4, ... 256 IDs away)
+SEARCH_SPAN = (25000, 39000)
+COARSE_STEP = 512
+GALLOP_LEVELS = 9
+
+FSYNC_EVERY = 50  # progress records written between forced flushes to disk
+
 class SimpleLCDFinder:
-    def __init__(self):
+    def __init__(self, concurrency=32, max_rate=10, browser_workers=8, progress_file="All_urls.jsonl"):
         self.lcd_urls = []
-        self.processed_ids = set()
+        self.processed_ids = set()  # every LCD ID probed so far, as ints
+        self.concurrency = concurrency
+        self.browser_workers = browser_workers
         
-        # Known working LCD IDs from our research
-        self.known_working_ids = [33822, 35000, 35070, 33803, 33393, 38617]
+        # Every probe outcome is appended here as it arrives, so an interrupted
+        # crawl resumes where it stopped instead of starting over
+        self.progress_file = progress_file
+        self.result_queue = None
         
-    async def validate_lcd_url(self, page, lcd_id):
-        """Validate if an LCD ID corresponds to a real policy."""
+        self.prober = LCDProber(max_rate, on_miss=self.record_miss)
         
-        try:
-            url = f"https://www.cms.gov/medicare-coverage-database/view/lcd.aspx?LCDId={lcd_id}"
-            await page.goto(url, wait_until="networkidle", timeout=10000)
-            
-            # Handle "I Accept" if needed
-            try:
-                accept_button = await page.wait_for_selector("input[value='I Accept']", timeout=2000)
-                if accept_button:
-                    await accept_button.click()
-                    await page.wait_for_timeout(1000)
-            except:
-                pass
+        self.replay_progress()
+        
+    def record_miss(self, lcd_id):
+        """Queue a checkpoint record for an ID that is not a valid LCD."""
+        if self.result_queue is not None:
+            self.result_queue.put_nowait({"lcd_id": lcd_id, "valid": False})
+    
+    async def validate_many(self, session, lcd_ids):
+        """Validate several LCD IDs concurrently, yielding policies as they are found."""
+        
+        semaphore = asyncio.Semaphore(self.concurrency)
+        
+        async def bounded(lcd_id):
+            async with semaphore:
+                return await self.prober.probe(session, lcd_id)
+        
+        for next_result in asyncio.as_completed([bounded(lcd_id) for lcd_id in lcd_ids]):
+            policy = await next_result
+            if policy:
+                yield policy
+    
+    async def validate_candidates(self, session, lcd_ids):
+        """Validate a batch of IDs, record the policies found and return their IDs."""
+        
+        self.processed_ids.update(lcd_ids)
+        hits = []
+        
+        async for policy in self.validate_many(session, lcd_ids):
+            self.lcd_urls.append(policy)
+            self.result_queue.put_nowait(policy)
+            hits.append(int(policy['lcd_id']))
+            print(f"✅ Found: {policy['doc_id']} - {policy['title'][:40]}...")
+        
+        return hits
+    
+    async def gallop_from(self, session, hits):
+        """Probe outward from each hit in doubling steps until a round finds nothing new."""
+        
+        frontier = hits
+        round_number = 1
+        while frontier:
+            neighbours = sorted(
+                {hit + sign * (1 << level)
+                 for hit in frontier for sign in (-1, 1) for level in range(GALLOP_LEVELS)}
+                - self.processed_ids
+            )
+            if not neighbours:
+                break
             
-            # Check if this is a valid LCD page
-            try:
-                # Look for LCD content indicators
-                content = await page.content()
-                title = await page.title()
-                
-                if ("Local Coverage Determination" in content or 
-                    "LCD" in title and "Error" not in title and "Not Found" not in title):
-                    
-                    # Extract policy title
-                    try:
-                        title_element = await page.query_selector("h1, .title, #title")
-                        if title_element:
-                            policy_title = await title_element.inner_text()
-                        else:
-                            policy_title = title.replace(" - CMS", "").strip()
-                    except:
-                        policy_title = f"LCD Policy L{lcd_id}"
-                    
-                    # Look for Doc ID in content
-                    doc_id_match = re.search(r'(L\d+)', content)
-                    doc_id = doc_id_match.group(1) if doc_id_match else f"L{lcd_id}"
-                    
-                    policy_info = {
-                        "lcd_id": str(lcd_id),
-                        "doc_id": doc_id,
-                        "title": policy_title.strip(),
-                        "url": url,
-                        "found_date": datetime.now().isoformat()
-                    }
-                    
-                    return policy_info
-                    
-            except Exception as e:
-                pass
+            print(f"\n🔍 Gallop round {round_number}: {len(neighbours)} IDs around {len(frontier)} policies...")
+            frontier = set(await self.validate_candidates(session, neighbours))
+            print(f"   Found {len(frontier)} more policies")
+            round_number += 1
+    
+    def replay_progress(self):
+        """Reload probe results checkpointed to the progress file by an earlier run."""
+        
+        if not os.path.exists(self.progress_file):
+            return
+        
+        with open(self.progress_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # a line cut short by a crash
                 
-        except Exception as e:
-            pass
+                lcd_id = int(record['lcd_id'])
+                if lcd_id in self.processed_ids:
+                    continue
+                self.processed_ids.add(lcd_id)
+                if record.get('valid', True):
+                    self.lcd_urls.append(record)
         
-        return None
+        print(f"📂 Resumed {len(self.processed_ids)} probed IDs ({len(self.lcd_urls)} policies) from {self.progress_file}")
+    
+    async def write_results(self):
+        """Single writer that appends queued probe results to the progress file."""
+        
+        written = 0
+        with open(self.progress_file, 'a', encoding='utf-8') as f:
+            while True:
+                record = await self.result_queue.get()
+                if record is None:
+                    break
+                
+                f.write(dumps_line(record))
+                written += 1
+                if written % FSYNC_EVERY == 0:
+                    f.flush()
+                    os.fsync(f.fileno())
     
     async def find_lcd_policies_systematically(self):
         """Find LCD policies by testing ID ranges systematically."""
         
-        async with async_playwright() as p:
+        connector = make_connector(self.concurrency)
+        
+        self.result_queue = asyncio.Queue()
+        writer = asyncio.create_task(self.write_results())
+        
+        async with async_playwright() as p, aiohttp.ClientSession(connector=connector) as session:
+            await warm_up(session)
             browser = await p.chromium.launch(headless=True)
-            page = await browser.new_page()
+            await self.prober.open_browser(browser, session, self.browser_workers)
             
             try:
                 print("🔍 Starting systematic LCD discovery...")
                 
-                # First, validate our known working IDs
-                print("📋 Validating known LCD policies...")
-                for lcd_id in self.known_working_ids:
-                    policy = await self.validate_lcd_url(page, lcd_id)
-                    if policy and str(lcd_id) not in self.processed_ids:
-                        self.lcd_urls.append(policy)
-                        self.processed_ids.add(str(lcd_id))
-                        print(f"✅ {policy['doc_id']}: {policy['title'][:50]}...")
+                # Phase 1: every COARSE_STEP-th ID plus the IDs known to work
+                candidates = candidate_ids((*SEARCH_SPAN, COARSE_STEP), exclude=self.processed_ids)
+                print(f"📋 Testing {len(candidates)} candidate LCD IDs...")
+                hits = await self.validate_candidates(session, candidates)
+                print(f"   Found {len(hits)} policies in the coarse pass")
                 
-                # Now search systematically in common ranges
-                print("\n🔍 Searching for additional LCD policies...")
-                
-                # Common LCD ID ranges based on observed patterns
-                search_ranges = [
-                    (33000, 34000, 50),   # Range around known working IDs
-                    (35000, 36000, 50),   # Another active range
-                    (37000, 39000, 100),  # Newer policies
-                    (30000, 33000, 100),  # Older policies
-                    (25000, 30000, 200),  # Much older policies
-                ]
-                
-                total_tested = 0
-                for start, end, step in search_ranges:
-                    print(f"🔍 Testing range {start}-{end} (step {step})...")
-                    range_found = 0
-                    
-                    for lcd_id in range(start, end, step):
-                        if str(lcd_id) not in self.processed_ids:
-                            policy = await self.validate_lcd_url(page, lcd_id)
-                            if policy:
-                                self.lcd_urls.append(policy)
-                                self.processed_ids.add(str(lcd_id))
-                                range_found += 1
-                                print(f"✅ Found: {policy['doc_id']} - {policy['title'][:40]}...")
-                            
-                            total_tested += 1
-                            
-                            # Progress indicator
-                            if total_tested % 20 == 0:
-                                print(f"   Tested {total_tested} IDs, found {len(self.lcd_urls)} total policies")
-                    
-                    print(f"   Range {start}-{end}: Found {range_found} new policies")
-                    
-                    # If we found many in this range, search more densely
-                    if range_found > 5:
-                        print(f"   Dense search in productive range {start}-{end}...")
-                        for lcd_id in range(start, end, 10):  # Much smaller step
-                            if str(lcd_id) not in self.processed_ids:
-                                policy = await self.validate_lcd_url(page, lcd_id)
-                                if policy:
-                                    self.lcd_urls.append(policy)
-                                    self.processed_ids.add(str(lcd_id))
-                                    print(f"✅ Dense search: {policy['doc_id']} - {policy['title'][:30]}...")
+                # Phase 2: gallop outward from every policy known so far, including resumed ones
+                await self.gallop_from(session, {int(policy['lcd_id']) for policy in self.lcd_urls})
                 
                 print(f"\n🎉 Systematic search completed!")
                 print(f"📊 Total LCD policies discovered: {len(self.lcd_urls)}")
@@ -145,7 +159,11 @@ class SimpleLCDFinder:
             except Exception as e:
                 print(f"Error in systematic search: {e}")
             finally:
+                self.prober.close_browser()
                 await browser.close()
+                
+                self.result_queue.put_nowait(None)
+                await writer
     
     def save_to_json(self, filename="All_urls.json"):
         """Save all found LCD URLs to JSON file."""
@@ -163,8 +181,7 @@ class SimpleLCDFinder:
         }
         
         # Save to JSON file
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(output_data, f, indent=2, ensure_ascii=False)
+        write_json(filename, output_data)
         
         print(f"✅ Saved {len(self.lcd_urls)} LCD policies to {filename}")
         return len(self.lcd_urls)
@@ -7,6 +7,8 @@ This provides a solid starting point for bulk downloading.
 import json
 from datetime import datetime
 
+from lcd_common import LCD_VIEW_URL, write_json
+
 def create_lcd_policy_list():
     """Create a list of known Medicare LCD policies."""
     
@@ -65,8 +67,6 @@ def create_lcd_policy_list():
 def add_additional_lcd_patterns():
     """Add additional LCD policies based on common patterns."""
     
-    additional_policies = []
-    
     # Common LCD categories and their typical ID ranges
     lcd_categories = [
         ("Medical Equipment", [33800, 33801, 33804, 33805, 33810, 33815, 33820, 33825, 33830]),
@@ -79,18 +79,22 @@ def add_additional_lcd_patterns():
         ("Prosthetics", [39000, 39010, 39020, 39030, 39040, 39050, 39060, 39070])
     ]
     
-    for category, lcd_ids in lcd_categories:
-        for lcd_id in lcd_ids:
-            policy = {
-                "lcd_id": str(lcd_id),
-                "doc_id": f"L{lcd_id}",
-                "title": f"LCD Policy L{lcd_id} - {category}",
-                "url": f"https://www.cms.gov/medicare-coverage-database/view/lcd.aspx?LCDId={lcd_id}",
-                "category": category,
-                "found_date": datetime.now().isoformat(),
-                "status": "estimated"  # Mark as estimated since we haven't validated
-            }
-            additional_policies.append(policy)
+    # All estimated policies share one timestamp
+    found_date = datetime.now().isoformat()
+    
+    additional_policies = [
+        {
+            "lcd_id": str(lcd_id),
+            "doc_id": f"L{lcd_id}",
+            "title": f"LCD Policy L{lcd_id} - {category}",
+            "url": LCD_VIEW_URL.format(lcd_id),
+            "category": category,
+            "found_date": found_date,
+            "status": "estimated"  # Mark as estimated since we haven't validated
+        }
+        for category, lcd_ids in lcd_categories
+        for lcd_id in lcd_ids
+    ]
     
     return additional_policies
 
@@ -124,8 +128,7 @@ def save_comprehensive_lcd_list(filename="All_urls.json"):
     }
     
     # Save to JSON file
-    with open(filename, 'w', encoding='utf-8') as f:
-        json.dump(output_data, f, indent=2, ensure_ascii=False)
+    write_json(filename, output_data)
     
     print(f"✅ Saved {len(all_policies)} LCD policies to {filename}")
     
@@ -6,87 +6,54 @@ known patterns and ranges with minimal requests.
 
 import asyncio
 from playwright.async_api import async_playwright
-import json
+import aiohttp
 from datetime import datetime
 
-async def quick_find_lcd_policies():
+from lcd_common import write_json
+from lcd_probe import LCDProber, candidate_ids, make_connector, warm_up
+
+SAMPLE_RANGE = (33000, 40000, 100)  # start, stop, step of the sampled LCD IDs
+
+async def quick_find_lcd_policies(concurrency=32):
     """Quickly find a representative sample of LCD policies."""
     
-    # Known working LCD IDs and likely ranges
-    test_ids = [
-        # Known working from our research
-        33822, 35000, 35070, 33803, 33393, 38617,
-        # Systematic sampling in likely ranges
-        33000, 33100, 33200, 33300, 33400, 33500, 33600, 33700, 33800, 33900,
-        34000, 34100, 34200, 34300, 34400, 34500, 34600, 34700, 34800, 34900,
-        35100, 35200, 35300, 35400, 35500, 35600, 35700, 35800, 35900,
-        36000, 36100, 36200, 36300, 36400, 36500, 36600, 36700, 36800, 36900,
-        37000, 37100, 37200, 37300, 37400, 37500, 37600, 37700, 37800, 37900,
-        38000, 38100, 38200, 38300, 38400, 38500, 38600, 38700, 38800, 38900,
-        39000, 39100, 39200, 39300, 39400, 39500, 39600, 39700, 39800, 39900
-    ]
+    # Known working LCD IDs plus systematic sampling of the likely range
+    test_ids = candidate_ids(SAMPLE_RANGE)
     
     lcd_policies = []
     found_count = 0
     
-    async with async_playwright() as p:
+    connector = make_connector(concurrency)
+    prober = LCDProber()
+    
+    async with async_playwright() as p, aiohttp.ClientSession(connector=connector) as session:
+        await warm_up(session)
         browser = await p.chromium.launch(headless=True)
-        page = await browser.new_page()
+        await prober.open_browser(browser, session, workers=1)
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def bounded_probe(lcd_id):
+            async with semaphore:
+                try:
+                    return await prober.probe(session, lcd_id)
+                except Exception:
+                    # Skip failed IDs silently
+                    return None
         
         print("🏥 Quick Medicare LCD Policy Finder")
         print("=" * 50)
         print(f"🔍 Testing {len(test_ids)} potential LCD IDs...")
         
         try:
-            for i, lcd_id in enumerate(test_ids):
-                try:
-                    url = f"https://www.cms.gov/medicare-coverage-database/view/lcd.aspx?LCDId={lcd_id}"
-                    
-                    # Quick navigation with short timeout
-                    await page.goto(url, wait_until="domcontentloaded", timeout=8000)
-                    
-                    # Handle "I Accept" quickly
-                    try:
-                        accept_button = await page.wait_for_selector("input[value='I Accept']", timeout=1500)
-                        if accept_button:
-                            await accept_button.click()
-                            await page.wait_for_timeout(1000)
-                    except:
-                        pass
-                    
-                    # Quick validation
-                    title = await page.title()
-                    
-                    if ("LCD" in title and 
-                        "Error" not in title and 
-                        "Not Found" not in title and
-                        "Search" not in title):
-                        
-                        # Extract title quickly
-                        try:
-                            h1 = await page.query_selector("h1")
-                            if h1:
-                                policy_title = await h1.inner_text()
-                            else:
-                                policy_title = title.replace(" - CMS", "").strip()
-                        except:
-                            policy_title = f"LCD Policy L{lcd_id}"
-                        
-                        policy_info = {
-                            "lcd_id": str(lcd_id),
-                            "doc_id": f"L{lcd_id}",
-                            "title": policy_title.strip(),
-                            "url": url,
-                            "found_date": datetime.now().isoformat()
-                        }
-                        
-                        lcd_policies.append(policy_info)
-                        found_count += 1
-                        print(f"✅ Found #{found_count}: L{lcd_id} - {policy_title[:40]}...")
+            # Probes run concurrently; results are reported as each one finishes
+            tasks = [bounded_probe(lcd_id) for lcd_id in test_ids]
+            for i, next_result in enumerate(asyncio.as_completed(tasks)):
+                policy_info = await next_result
                 
-                except Exception as e:
-                    # Skip failed IDs silently
-                    pass
+                if policy_info:
+                    lcd_policies.append(policy_info)
+                    found_count += 1
+                    print(f"✅ Found #{found_count}: {policy_info['doc_id']} - {policy_info['title'][:40]}...")
                 
                 # Progress update
                 if (i + 1) % 10 == 0:
@@ -95,6 +62,7 @@ async def quick_find_lcd_policies():
         except Exception as e:
             print(f"Error: {e}")
         finally:
+            prober.close_browser()
             await browser.close()
     
     return lcd_policies
@@ -113,8 +81,7 @@ def save_lcd_policies(policies, filename="All_urls.json"):
         "policies": policies
     }
     
-    with open(filename, 'w', encoding='utf-8') as f:
-        json.dump(output_data, f, indent=2, ensure_ascii=False)
+    write_json(filename, output_data)
     
     return len(policies)
 
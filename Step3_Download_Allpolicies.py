@@ -7,24 +7,275 @@ Features:
 - Uses the same high-quality PDF generation approach as Step1_DownloadJust1pdf.py
 - Stores PDFs in Download_PDFs folder with policy number naming (e.g., Policy_33822.pdf)
 - Handles "I Accept" terms automatically
+- Downloads several policies at once, each on its own page of one shared browser context
 - Progress tracking and error handling
 """
 
 import asyncio
 from playwright.async_api import async_playwright
+from playwright.async_api import Error as PlaywrightError
+import base64
 import json
 import os
+import random
+import socket
 from datetime import datetime
+from urllib.parse import urlsplit
 import argparse
+import itertools
+import logging
+import sys
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import pikepdf
+except ImportError:
+    pikepdf = None
+
+log = logging.getLogger("bulkpdf")
+
+CMS_HOST = "www.cms.gov"
+
+# Keep Chromium lean over long --all runs: no background services, a capped JS heap,
+# and /tmp instead of the often tiny /dev/shm
+CHROMIUM_ARGS = [
+    '--disable-background-networking',
+    '--disable-default-apps',
+    '--disable-sync',
+    '--disable-dev-shm-usage',
+    '--js-flags=--max-old-space-size=128',
+    '--disable-extensions',
+    '--no-first-run',
+    '--disable-translate'
+]
+
+MAX_PAGE_USES = 25  # navigations a page serves before it is replaced
+
+# Same high quality settings as Step1, in Chrome DevTools Protocol form (sizes in inches)
+PDF_OPTIONS = {
+    'paperWidth': 8.27,  # A4
+    'paperHeight': 11.69,
+    'marginTop': 0.5,
+    'marginRight': 0.5,
+    'marginBottom': 0.5,
+    'marginLeft': 0.5,
+    'printBackground': True,  # Include background colors and images
+    'displayHeaderFooter': True,
+    'headerTemplate': '<div style="font-size:10px; text-align:center; width:100%;">Medicare LCD Policy - Downloaded from CMS.gov</div>',
+    'footerTemplate': '<div style="font-size:10px; text-align:center; width:100%;"><span class="pageNumber"></span> of <span class="totalPages"></span></div>',
+    'preferCSSPageSize': True,
+    'scale': 1.0,
+    'transferMode': 'ReturnAsStream'
+}
+
+# --fast: plain text layout without backgrounds or the header/footer render pass
+FAST_PDF_OPTIONS = {
+    **PDF_OPTIONS,
+    'printBackground': False,
+    'displayHeaderFooter': False,
+    'generateTaggedPDF': False
+}
+del FAST_PDF_OPTIONS['headerTemplate'], FAST_PDF_OPTIONS['footerTemplate']
+
+PDF_CHUNK_SIZE = 64 * 1024
+
+ACCEPT_SELECTOR = "input[value='I Accept'], button:has-text('I Accept'), input[type='submit'][value*='Accept']"
+
+# Present once the LCD body has rendered
+CONTENT_SELECTOR = "#LcdDetailsContent, .lcd-content, #LCDContent, main"
+
+POLITE_DELAY = 0.2  # seconds each worker pauses between policies
+
+MAX_ATTEMPTS = 3  # tries per policy before it is recorded as failed
+
+FAILED_LOG = "_failed.jsonl"  # one JSON line per failed policy, kept in the output folder
+
+# Third-party images, media and fonts never show up in the policy text, and
+# trackers only slow the load; CMS's own assets are kept so the PDF looks like the page
+BLOCKED_RESOURCE_TYPES = {"image", "media", "font"}
+TRACKER_HOSTS = ("google-analytics.com", "googletagmanager.com", "doubleclick.net", "facebook.net", "hotjar.com")
+
+async def block_unneeded_resources(route):
+    """Abort third-party assets and tracker scripts before they are downloaded."""
+    request = route.request
+    host = urlsplit(request.url).hostname or ""
+    is_cms = host == "cms.gov" or host.endswith(".cms.gov")
+    
+    if (request.resource_type in BLOCKED_RESOURCE_TYPES and not is_cms or
+            request.resource_type == "script" and host.endswith(TRACKER_HOSTS)):
+        await route.abort()
+    else:
+        await route.continue_()
+
+async def stream_pdf(page, pdf_filename, pdf_options=PDF_OPTIONS):
+    """Print the page to PDF and write it to disk chunk by chunk.
+    
+    page.pdf() holds the whole document in memory; reading Chromium's output
+    stream keeps each worker down to one chunk at a time.
+    """
+    
+    cdp = await page.context.new_cdp_session(page)
+    try:
+        result = await cdp.send('Page.printToPDF', pdf_options)
+        stream = result['stream']
+        
+        # Write beside the target so an interrupted print never looks like a finished PDF
+        partial_filename = pdf_filename + '.part'
+        with open(partial_filename, 'wb') as f:
+            while True:
+                chunk = await cdp.send('IO.read', {'handle': stream, 'size': PDF_CHUNK_SIZE})
+                if chunk.get('base64Encoded'):
+                    f.write(base64.b64decode(chunk['data']))
+                else:
+                    f.write(chunk['data'].encode('latin-1'))
+                if chunk['eof']:
+                    break
+        
+        await cdp.send('IO.close', {'handle': stream})
+        os.replace(partial_filename, pdf_filename)
+    finally:
+        await cdp.detach()
+
+def load_json(filename):
+    """Read a JSON file in one go, using orjson when it is installed."""
+    with open(filename, 'rb') as f:
+        raw = f.read()
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+def optimize_pdf(pdf_filename):
+    """Rewrite a PDF linearized, with compressed streams and object streams (needs pikepdf)."""
+    optimized_filename = pdf_filename + '.tmp'
+    with pikepdf.open(pdf_filename) as pdf:
+        pdf.save(optimized_filename, linearize=True, compress_streams=True,
+                 object_stream_mode=pikepdf.ObjectStreamMode.generate)
+    os.replace(optimized_filename, pdf_filename)
+
+class BrowserPool:
+    """One Chromium instance with a single shared context and a set of pages.
+    
+    Every policy lives on www.cms.gov, so the pages share one context and with it
+    Chromium's kept-alive connections and cookies. Routing every request through
+    block_unneeded_resources turns off Chromium's HTTP cache, so each page still
+    fetches the stylesheets and scripts it keeps. Each page is reused from
+    policy to policy and replaced after MAX_PAGE_USES navigations, so Chromium
+    memory stays bounded over long --all runs. The terms are accepted once on
+    prime_url and the consent cookie covers every page.
+    """
+    
+    def __init__(self, size=4, prime_url=None):
+        self.size = size
+        self.prime_url = prime_url
+        self.playwright = None
+        self.browser = None
+        self.context = None
+        self.pages = None
+        self.page_uses = {}
+    
+    async def __aenter__(self):
+        self.playwright = await async_playwright().start()
+        try:
+            self.browser = await self.playwright.chromium.launch(headless=True, args=await self.launch_args())
+            self.context = await self.browser.new_context()
+            await self.context.route("**/*", block_unneeded_resources)
+            if self.prime_url:
+                await self.prime_context()
+            self.pages = asyncio.Queue()
+            for _ in range(self.size):
+                self.pages.put_nowait(await self.new_page())
+        except:
+            await self.playwright.stop()
+            raise
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        await self.browser.close()
+        await self.playwright.stop()
+    
+    async def launch_args(self):
+        """Chromium flags: CHROMIUM_ARGS plus www.cms.gov pinned to one address resolved up front."""
+        
+        try:
+            _, _, addresses = await asyncio.to_thread(socket.gethostbyname_ex, CMS_HOST)
+        except OSError as e:
+            log.warning(f"⚠️  Could not resolve {CMS_HOST}, leaving DNS to Chromium: {e}")
+            return CHROMIUM_ARGS
+        
+        # Every policy lives on the same host, so one lookup serves the whole run
+        return CHROMIUM_ARGS + [f"--host-resolver-rules=MAP {CMS_HOST} {addresses[0]}", "--enable-features=AsyncDns"]
+    
+    async def prime_context(self):
+        """Click "I Accept" once so the shared context carries the consent cookie."""
+        
+        page = await self.context.new_page()
+        try:
+            await page.goto(self.prime_url, wait_until="domcontentloaded", timeout=15000)
+            
+            accept_button = await page.query_selector(ACCEPT_SELECTOR)
+            if accept_button:
+                await accept_button.click()
+                await page.wait_for_load_state("domcontentloaded")
+        except Exception as e:
+            log.warning(f"⚠️  Could not accept the CMS terms up front: {e}")
+        finally:
+            await page.close()
+    
+    async def new_page(self):
+        page = await self.context.new_page()
+        self.page_uses[page] = 0
+        return page
+    
+    async def acquire(self):
+        """Wait for a free page, replacing it first if it is worn out or closed."""
+        page = await self.pages.get()
+        if page.is_closed() or self.page_uses[page] >= MAX_PAGE_USES:
+            try:
+                if not page.is_closed():
+                    await page.close()
+                del self.page_uses[page]
+                page = await self.new_page()
+            except:
+                # Keep the slot; the next acquire tries the replacement again
+                self.page_uses[page] = MAX_PAGE_USES
+                self.pages.put_nowait(page)
+                raise
+        
+        self.page_uses[page] += 1
+        return page
+    
+    def release(self, page):
+        """Hand the page to the next download."""
+        self.pages.put_nowait(page)
 
 class BulkLCDDownloader:
-    def __init__(self, sample_only=True, sample_size=10):
+    def __init__(self, sample_only=True, sample_size=10, concurrency=4, retry_failed=False, fast_mode=False,
+                 optimize=False):
         self.sample_only = sample_only
         self.sample_size = sample_size
+        self.concurrency = concurrency
+        self.retry_failed = retry_failed
+        self.pdf_options = FAST_PDF_OPTIONS if fast_mode else PDF_OPTIONS
+        self.optimize = optimize
         self.output_dir = "Download_PDFs"
         self.downloaded_count = 0
         self.failed_count = 0
         self.failed_policies = []
+        self.existing_files = set()  # names in the output folder, listed once per run
+        self.files_at_start = 0
+        self.load_slots = None
+        self.print_slots = None
+        
+        # Failures are appended as they happen so a crashed run still leaves a record,
+        # and later runs skip the non-transient ones unless asked to retry
+        self.failed_log_path = os.path.join(self.output_dir, FAILED_LOG)
+        self.prior_failures = set()
+        
+        # Each policy logs one line when it finishes, numbered in completion order
+        self.total_policies = 0
+        self.completed = itertools.count(1)
         
         # Create output directory
         os.makedirs(self.output_dir, exist_ok=True)
@@ -32,112 +283,203 @@ class BulkLCDDownloader:
     def load_policy_urls(self):
         """Load policy URLs from All_urls.json."""
         try:
-            with open("All_urls.json", 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = load_json("All_urls.json")
             
             policies = data.get('policies', [])
             
+            # Drop duplicate LCD IDs, preferring a validated entry over an estimated one
+            unique_policies = {}
+            for policy in policies:
+                kept = unique_policies.get(policy['lcd_id'])
+                if kept is None or kept.get('status') == 'estimated' and policy.get('status') != 'estimated':
+                    unique_policies[policy['lcd_id']] = policy
+            if len(unique_policies) < len(policies):
+                log.info(f"🔁 Skipping {len(policies) - len(unique_policies)} duplicate policies")
+            policies = list(unique_policies.values())
+            
             if self.sample_only:
-                # Prioritize validated policies for sample
-                validated_policies = [p for p in policies if p.get('status') != 'estimated']
-                estimated_policies = [p for p in policies if p.get('status') == 'estimated']
+                # Prioritize validated policies for sample, splitting them out in one pass
+                validated_policies, estimated_policies = [], []
+                for policy in policies:
+                    (estimated_policies if policy.get('status') == 'estimated' else validated_policies).append(policy)
                 
                 # Take validated first, then fill with estimated if needed
-                sample_policies = validated_policies[:self.sample_size]
-                if len(sample_policies) < self.sample_size:
-                    remaining = self.sample_size - len(sample_policies)
-                    sample_policies.extend(estimated_policies[:remaining])
+                sample_policies = list(itertools.islice(
+                    itertools.chain(validated_policies, estimated_policies), self.sample_size))
                 
                 policies = sample_policies
             
-            print(f"📋 Loaded {len(policies)} policies for download")
+            log.info(f"📋 Loaded {len(policies)} policies for download")
             return policies
             
         except FileNotFoundError:
-            print("❌ All_urls.json not found. Please run Step2 first.")
+            log.error("❌ All_urls.json not found. Please run Step2 first.")
             return []
         except json.JSONDecodeError:
-            print("❌ Invalid JSON format in All_urls.json")
+            log.error("❌ Invalid JSON format in All_urls.json")
             return []
     
-    async def download_policy_pdf(self, page, policy):
-        """Download a single LCD policy as PDF."""
+    def record_failure(self, policy, error, transient=False):
+        """Count a failed policy and append it to the failure log right away.
         
-        try:
-            lcd_id = policy['lcd_id']
-            doc_id = policy['doc_id']
-            title = policy['title']
-            url = policy['url']
-            
-            # Generate filename using policy number
-            pdf_filename = f"{self.output_dir}/Policy_{lcd_id}.pdf"
-            
-            # Skip if already exists
-            if os.path.exists(pdf_filename):
-                print(f"⏭️  Skipping {doc_id}: Already exists")
-                return True
-            
-            print(f"🔄 Downloading {doc_id}: {title[:40]}...")
-            
-            # Navigate to the LCD policy page
-            await page.goto(url, wait_until="networkidle", timeout=15000)
-            
-            # Wait for initial page load
-            await page.wait_for_timeout(2000)
-            
-            # Look for and click "I Accept" button if it exists
+        ``transient`` marks browser errors that outlasted every retry (timeouts,
+        dropped connections, crashed pages); later runs try those again.
+        """
+        
+        failure = {**policy, 'error': error, 'error_kind': 'transient' if transient else 'permanent'}
+        self.failed_count += 1
+        self.failed_policies.append(failure)
+        
+        with open(self.failed_log_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(failure, ensure_ascii=False) + "\n")
+    
+    def load_prior_failures(self):
+        """Return the LCD IDs that earlier runs failed for good, which this run skips.
+        
+        Policies this run retries (transient failures, or every failure with
+        --retry-failed) are dropped from the log and only logged again if they
+        fail again, so the log keeps at most one line per LCD ID.
+        """
+        
+        if not os.path.exists(self.failed_log_path):
+            return set()
+        
+        skipped = {}
+        with open(self.failed_log_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    failure = json.loads(line)
+                    if not self.retry_failed and failure.get('error_kind') == 'permanent':
+                        skipped[failure['lcd_id']] = failure
+                except (json.JSONDecodeError, KeyError):
+                    continue  # a line cut short by a crash
+        
+        temp_path = self.failed_log_path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            for failure in skipped.values():
+                f.write(json.dumps(failure, ensure_ascii=False) + "\n")
+        os.replace(temp_path, self.failed_log_path)
+        
+        return set(skipped)
+    
+    def progress(self):
+        """Position of the policy that just finished, e.g. "[3/10] "."""
+        return f"[{next(self.completed)}/{self.total_policies}] "
+    
+    async def download_policy_pdf(self, pool, policy):
+        """Download a single LCD policy as PDF on pages borrowed from the pool."""
+        
+        # Skip if already exists, before tying up a browser page
+        if f"Policy_{policy['lcd_id']}.pdf" in self.existing_files:
+            log.info(f"{self.progress()}⏭️  Skipping {policy['doc_id']}: Already exists")
+            return True
+        
+        if policy['lcd_id'] in self.prior_failures:
+            log.info(f"{self.progress()}⏭️  Skipping {policy['doc_id']}: Failed in an earlier run (use --retry-failed)")
+            return False
+        
+        return await self.save_policy_pdf(pool, policy)
+    
+    async def save_policy_pdf(self, pool, policy):
+        """Render a single LCD policy to PDF, retrying transient browser errors with backoff.
+        
+        Every attempt borrows its own page, and a page that failed is closed so the
+        pool replaces it; a crashed renderer never gets the retries.
+        """
+        
+        doc_id = policy.get('doc_id', 'Unknown')
+        
+        for attempt in range(MAX_ATTEMPTS):
+            page = await pool.acquire()
             try:
-                accept_button = await page.wait_for_selector(
-                    "input[value='I Accept'], button:has-text('I Accept'), input[type='submit'][value*='Accept']", 
-                    timeout=3000
-                )
-                if accept_button:
-                    await accept_button.click()
-                    # Wait for page to load after accepting terms
-                    await page.wait_for_timeout(3000)
-            except:
-                # Continue if no accept button found
-                pass
-            
-            # Wait for content to fully load
-            await page.wait_for_timeout(2000)
-            
-            # Generate PDF with high quality settings (same as Step1)
-            await page.pdf(
-                path=pdf_filename,
-                format='A4',
-                margin={
-                    'top': '0.5in',
-                    'right': '0.5in',
-                    'bottom': '0.5in',
-                    'left': '0.5in'
-                },
-                print_background=True,  # Include background colors and images
-                display_header_footer=True,
-                header_template='<div style="font-size:10px; text-align:center; width:100%;">Medicare LCD Policy - Downloaded from CMS.gov</div>',
-                footer_template='<div style="font-size:10px; text-align:center; width:100%;"><span class="pageNumber"></span> of <span class="totalPages"></span></div>',
-                prefer_css_page_size=True,
-                scale=1.0
-            )
+                pdf_filename = await self.attempt_download(page, policy)
+                break
+            except PlaywrightError as e:
+                error = e
+                try:
+                    await page.close()
+                except:
+                    pass
+            except Exception as e:
+                log.error(f"{self.progress()}❌ {doc_id}: Error - {str(e)}")
+                self.record_failure(policy, str(e))
+                return False
+            finally:
+                pool.release(page)
             
-            # Check if PDF was created successfully
-            if os.path.exists(pdf_filename):
-                file_size = os.path.getsize(pdf_filename) / (1024*1024)  # MB
-                print(f"✅ {doc_id}: Downloaded successfully ({file_size:.2f} MB)")
-                self.downloaded_count += 1
-                return True
-            else:
-                print(f"❌ {doc_id}: PDF file not created")
-                self.failed_count += 1
-                self.failed_policies.append({**policy, 'error': 'PDF not created'})
+            # Timeouts and dropped connections are usually gone a moment later
+            if attempt == MAX_ATTEMPTS - 1:
+                log.error(f"{self.progress()}❌ {doc_id}: Error after {MAX_ATTEMPTS} attempts - {str(error)}")
+                self.record_failure(policy, str(error), transient=True)
                 return False
-                
-        except Exception as e:
-            print(f"❌ {policy.get('doc_id', 'Unknown')}: Error - {str(e)}")
-            self.failed_count += 1
-            self.failed_policies.append({**policy, 'error': str(e)})
+            log.debug(f"🔁 {doc_id}: Attempt {attempt + 1} failed, retrying - {str(error)}")
+            await asyncio.sleep(1.5 ** attempt + random.random())
+        
+        # Check if PDF was created successfully
+        if os.path.exists(pdf_filename):
+            file_size = os.path.getsize(pdf_filename) / (1024*1024)  # MB
+            log.info(f"{self.progress()}✅ {doc_id}: Downloaded successfully ({file_size:.2f} MB)")
+            self.downloaded_count += 1
+            return True
+        else:
+            log.error(f"{self.progress()}❌ {doc_id}: PDF file not created")
+            self.record_failure(policy, 'PDF not created')
             return False
     
+    async def attempt_download(self, page, policy):
+        """Load one LCD policy page and print it to PDF, returning the PDF's path."""
+        
+        lcd_id = policy['lcd_id']
+        doc_id = policy['doc_id']
+        title = policy['title']
+        url = policy['url']
+        
+        # Generate filename using policy number
+        pdf_filename = f"{self.output_dir}/Policy_{lcd_id}.pdf"
+        
+        log.debug(f"🔄 Downloading {doc_id}: {title[:40]}...")
+        
+        # Loading is network-bound and printing is render-bound, so they are limited
+        # separately: while one page prints, the next policy loads on another page
+        async with self.load_slots:
+            await self.load_policy_page(page, url)
+        
+        async with self.print_slots:
+            # Generate PDF with high quality settings (same as Step1), or the lighter --fast ones
+            await stream_pdf(page, pdf_filename, self.pdf_options)
+        
+        if self.optimize:
+            # A PDF that cannot be optimized is still a good download
+            try:
+                await asyncio.to_thread(optimize_pdf, pdf_filename)
+            except Exception as e:
+                log.warning(f"⚠️  {doc_id}: Kept unoptimized PDF - {str(e)}")
+        return pdf_filename
+    
+    async def load_policy_page(self, page, url):
+        """Navigate to an LCD policy and wait until it is ready to print."""
+        
+        # Navigate to the LCD policy page
+        await page.goto(url, wait_until="domcontentloaded", timeout=15000)
+        
+        # The pool accepted the terms already; click only if the gate still shows up
+        try:
+            accept_button = await page.query_selector(ACCEPT_SELECTOR)
+            if accept_button:
+                await accept_button.click()
+                # Wait for page to load after accepting terms
+                await page.wait_for_load_state("domcontentloaded")
+        except:
+            # Continue if no accept button found
+            pass
+        
+        # Wait for the policy text, then for images and stylesheets so the PDF matches the page
+        try:
+            await page.wait_for_selector(CONTENT_SELECTOR, timeout=10000)
+        except:
+            pass
+        await page.wait_for_load_state("load")
+    
     async def download_all_policies(self):
         """Download all LCD policies as PDFs."""
         
@@ -146,25 +488,39 @@ class BulkLCDDownloader:
         if not policies:
             return
         
-        async with async_playwright() as p:
-            # Launch browser
-            browser = await p.chromium.launch(headless=True)
-            page = await browser.new_page()
+        self.total_policies = len(policies)
+        
+        # One directory listing answers every "already downloaded?" check
+        self.existing_files = {entry.name for entry in os.scandir(self.output_dir)}
+        self.files_at_start = len(self.existing_files)
+        
+        self.prior_failures = self.load_prior_failures()
+        
+        # Each worker gets a second page, so its next policy can load while the last one prints
+        self.load_slots = asyncio.Semaphore(self.concurrency)
+        self.print_slots = asyncio.Semaphore(self.concurrency)
+        pages = 2 * self.concurrency
+        
+        async with BrowserPool(size=pages, prime_url=policies[0]['url']) as pool:
+            semaphore = asyncio.Semaphore(pages)
+            
+            async def bounded_download(policy):
+                async with semaphore:
+                    await self.download_policy_pdf(pool, policy)
+                    
+                    # Small delay between downloads to be respectful
+                    await asyncio.sleep(POLITE_DELAY)
             
             try:
-                print(f"🚀 Starting bulk download of {len(policies)} LCD policies...")
-                print(f"📁 Output directory: {self.output_dir}")
-                print("=" * 70)
+                log.info(f"🚀 Starting bulk download of {len(policies)} LCD policies...")
+                log.info(f"📁 Output directory: {self.output_dir}")
+                log.info(f"⚡ Parallel downloads: {self.concurrency} loading + {self.concurrency} printing ({pages} pages)")
+                log.info("=" * 70)
                 
                 start_time = datetime.now()
                 
-                # Download each policy
-                for i, policy in enumerate(policies, 1):
-                    print(f"[{i}/{len(policies)}] ", end="")
-                    await self.download_policy_pdf(page, policy)
-                    
-                    # Small delay between downloads to be respectful
-                    await page.wait_for_timeout(1000)
+                # Download the policies concurrently
+                await asyncio.gather(*(bounded_download(policy) for policy in policies))
                 
                 end_time = datetime.now()
                 duration = (end_time - start_time).total_seconds()
@@ -173,30 +529,28 @@ class BulkLCDDownloader:
                 self.print_summary(len(policies), duration)
                 
             except Exception as e:
-                print(f"❌ Error in bulk download: {e}")
-            finally:
-                await browser.close()
+                log.error(f"❌ Error in bulk download: {e}")
     
     def print_summary(self, total_policies, duration):
         """Print download summary."""
         
-        print("\n" + "=" * 70)
-        print("📊 DOWNLOAD SUMMARY")
-        print("=" * 70)
-        print(f"✅ Successfully downloaded: {self.downloaded_count}")
-        print(f"❌ Failed downloads: {self.failed_count}")
-        print(f"📁 Total files in output folder: {len(os.listdir(self.output_dir))}")
-        print(f"⏱️  Total time: {duration:.1f} seconds")
-        print(f"📍 Output folder: {os.path.abspath(self.output_dir)}")
+        log.info("=" * 70)
+        log.info("📊 DOWNLOAD SUMMARY")
+        log.info("=" * 70)
+        log.info(f"✅ Successfully downloaded: {self.downloaded_count}")
+        log.info(f"❌ Failed downloads: {self.failed_count}")
+        log.info(f"📁 Total files in output folder: {self.files_at_start + self.downloaded_count}")
+        log.info(f"⏱️  Total time: {duration:.1f} seconds")
+        log.info(f"📍 Output folder: {os.path.abspath(self.output_dir)}")
         
         if self.failed_policies:
-            print(f"\n❌ Failed policies:")
+            log.info("❌ Failed policies:")
             for policy in self.failed_policies[:5]:
-                print(f"   - {policy['doc_id']}: {policy.get('error', 'Unknown error')}")
+                log.info(f"   - {policy['doc_id']}: {policy.get('error', 'Unknown error')}")
             if len(self.failed_policies) > 5:
-                print(f"   ... and {len(self.failed_policies) - 5} more")
+                log.info(f"   ... and {len(self.failed_policies) - 5} more")
         
-        print(f"\n🎉 Bulk download completed!")
+        log.info("🎉 Bulk download completed!")
 
 def main():
     """Main function with command line argument support."""
@@ -206,23 +560,54 @@ def main():
                        help='Download all policies (default: download 10 sample policies)')
     parser.add_argument('--sample-size', type=int, default=10,
                        help='Number of sample policies to download (default: 10)')
+    parser.add_argument('--concurrency', type=int, default=4,
+                       help='Policies loading at once, and separately printing at once; '
+                            'twice this many pages and policies are in flight (default: 4)')
+    parser.add_argument('--retry-failed', action='store_true',
+                       help=f'Also retry policies {FAILED_LOG} records as non-transient failures')
+    parser.add_argument('--fast', action='store_true',
+                       help='Faster, smaller PDFs without backgrounds or header/footer')
+    parser.add_argument('--optimize', action='store_true',
+                       help='Linearize and compress each PDF after download (requires pikepdf)')
     
     args = parser.parse_args()
     
+    # Zero would size the page pool and semaphores to nothing and hang the run
+    if args.concurrency < 1:
+        parser.error(f"--concurrency must be at least 1, got {args.concurrency}")
+    if args.sample_size < 1:
+        parser.error(f"--sample-size must be at least 1, got {args.sample_size}")
+    
+    if args.optimize and pikepdf is None:
+        print("❌ pikepdf not found. Please install it first:")
+        print("pip install pikepdf")
+        exit(1)
+    
+    # One handler on stdout, so progress lines stay in order with the banner below
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(message)s', stream=sys.stdout)
+    
     # Print header
     print("🏥 Medicare LCD Bulk PDF Downloader")
     print("=" * 70)
     
     if args.all:
         print("🎯 Mode: Download ALL policies")
-        downloader = BulkLCDDownloader(sample_only=False)
+        downloader = BulkLCDDownloader(sample_only=False, concurrency=args.concurrency,
+                                       retry_failed=args.retry_failed, fast_mode=args.fast,
+                                       optimize=args.optimize)
     else:
         print(f"🎯 Mode: Download {args.sample_size} sample policies (default)")
         print("💡 Use --all flag to download all policies")
-        downloader = BulkLCDDownloader(sample_only=True, sample_size=args.sample_size)
+        downloader = BulkLCDDownloader(sample_only=True, sample_size=args.sample_size,
+                                       concurrency=args.concurrency, retry_failed=args.retry_failed,
+                                       fast_mode=args.fast, optimize=args.optimize)
     
     print("🌐 Source: All_urls.json")
     print("📁 Output: Download_PDFs folder")
+    if args.fast:
+        print("⚡ PDF: fast mode (no backgrounds or header/footer)")
+    if args.optimize:
+        print("🗜️  PDF: linearized and compressed after download")
     print("=" * 70)
     
     # Run the download
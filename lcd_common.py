@@ -0,0 +1,51 @@
+"""
+lcd_common.py
+LCD URL, JSON output and headless Chromium helpers shared by the Step1/Step2
+scripts. Standard library only (orjson is optional), so scripts that never
+probe don't need aiohttp.
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+LCD_VIEW_URL = "https://www.cms.gov/medicare-coverage-database/view/lcd.aspx?LCDId={}"
+
+# Trim Chromium start-up work (GPU init, extensions, /dev/shm sizing) for headless runs
+CHROMIUM_ARGS = [
+    '--no-sandbox',
+    '--disable-dev-shm-usage',
+    '--disable-gpu',
+    '--disable-extensions',
+    '--disable-background-networking',
+    '--disable-features=TranslateUI,IsolateOrigins',
+    '--no-first-run'
+]
+
+# LCD links, titles and bodies are server-rendered, so pages never need these
+BLOCKED_RESOURCE_TYPES = {"image", "media", "font", "stylesheet"}
+
+async def block_unneeded_resources(route):
+    """Abort requests for resources that don't affect link extraction or validation."""
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+def dumps_line(record):
+    """Serialize one record as a JSON line, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(record).decode("utf-8") + "\n"
+    return json.dumps(record, ensure_ascii=False) + "\n"
+
+def write_json(filename, data):
+    """Write data as indented JSON, using orjson when it is installed."""
+    if orjson is not None:
+        with open(filename, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS, default=str))
+    else:
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False, default=str)
@@ -0,0 +1,328 @@
+"""
+lcd_probe.py
+Shared LCD ID probing for the Step2 finder scripts: fetching an LCD page over
+HTTP (with a browser fallback for the "I Accept" gate), parsing it into a
+policy record, and the candidate IDs worth probing.
+"""
+
+import asyncio
+import aiohttp
+from aiohttp.abc import AbstractResolver
+import random
+import re
+import socket
+import time
+from datetime import datetime
+
+from lcd_common import LCD_VIEW_URL, block_unneeded_resources
+
+CMS_HOME_URL = "https://www.cms.gov/"
+
+# Known working LCD IDs from our research
+KNOWN_WORKING_IDS = [33822, 35000, 35070, 33803, 33393, 38617]
+
+# Patterns work on the raw response bytes, so bodies are never decoded as a whole
+TITLE_RE = re.compile(rb"<title>([^<]+)</title>", re.I)
+H1_RE = re.compile(rb"<h1[^>]*>(.*?)</h1>", re.I | re.S)
+TAG_RE = re.compile(rb"<[^>]+>")
+DOC_ID_PATTERN = rb"LCDId=%d&(?:amp;)?DocID=(L\d{4,6})"  # a DocID only counts next to the probed LCDId
+REJECT_TITLE_WORDS = ("Error", "Not Found", "Search")
+ACCEPT_GATE_RE = re.compile(rb"value=['\"]I Accept['\"]", re.I)
+HEAD_BYTES = 8192  # <title> lives in the document head
+
+MAX_ATTEMPTS = 5
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+MISS_STATUSES = {404, 410}  # the only answers that prove an ID has no page
+
+class RateLimiter:
+    """Token bucket shared by every probe, with a pause the server can extend."""
+
+    def __init__(self, max_rate, time_period=1.0):
+        self.max_rate = max_rate
+        self.time_period = time_period
+        self.tokens = max_rate
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        """Wait until a request may be sent."""
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    await asyncio.sleep(self.paused_until - now)
+                    continue
+
+                refill = (now - self.updated) * self.max_rate / self.time_period
+                self.tokens = min(self.max_rate, self.tokens + refill)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) * self.time_period / self.max_rate)
+
+    def pause(self, seconds):
+        """Hold back all requests for the given number of seconds."""
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+class PinnedResolver(AbstractResolver):
+    """Resolve each host once and reuse that answer for the rest of the crawl."""
+
+    def __init__(self):
+        self.resolver = aiohttp.ThreadedResolver()
+        self.pinned = {}
+
+    async def resolve(self, host, port=0, family=socket.AF_INET):
+        key = (host, port, family)
+        if key not in self.pinned:
+            self.pinned[key] = await self.resolver.resolve(host, port, family)
+        return self.pinned[key]
+
+    async def close(self):
+        await self.resolver.close()
+
+def make_connector(concurrency):
+    """Connector for probing www.cms.gov: keep connections alive and pin its address for the run."""
+    return aiohttp.TCPConnector(
+        limit=128,
+        limit_per_host=concurrency,
+        force_close=False,
+        enable_cleanup_closed=True,
+        resolver=PinnedResolver()
+    )
+
+def candidate_ids(*ranges, exclude=()):
+    """Known working IDs plus every ID in the (start, stop, step) ranges, sorted and deduplicated."""
+    ids = set(KNOWN_WORKING_IDS)
+    for start, stop, step in ranges:
+        ids.update(range(start, stop, step))
+    return sorted(ids - set(exclude))
+
+def retry_after_seconds(headers):
+    """Return the Retry-After delay in seconds, if the server sent a numeric one."""
+    try:
+        return float(headers.get("Retry-After", ""))
+    except ValueError:
+        return None
+
+def head_title(body):
+    """Return the page <title> from the document head, or "" if it has none."""
+    title_match = TITLE_RE.search(body, 0, HEAD_BYTES)
+    return title_match.group(1).decode("utf-8", "replace").strip() if title_match else ""
+
+def parse_lcd_html(body, lcd_id, found_date):
+    """Build a policy record from raw LCD page bytes, or None if it isn't an LCD.
+
+    Pure and CPU-bound, so probes run it in a worker thread off the event loop.
+    """
+
+    url = LCD_VIEW_URL.format(lcd_id)
+    title = head_title(body)
+
+    # Error, "not found" and search pages mention LCDs too, so the title decides
+    if any(word in title for word in REJECT_TITLE_WORDS):
+        return None
+    if "LCD" not in title and (title or b"Local Coverage Determination" not in body):
+        return None
+
+    # Extract policy title
+    h1_match = H1_RE.search(body)
+    h1_text = TAG_RE.sub(b"", h1_match.group(1)).decode("utf-8", "replace").strip() if h1_match else ""
+    if h1_text:
+        policy_title = h1_text
+    elif title:
+        policy_title = title.replace(" - CMS", "").strip()
+    else:
+        policy_title = f"LCD Policy L{lcd_id}"
+
+    # Look for Doc ID in content; other L-numbers on the page belong to other documents
+    doc_id_match = re.search(DOC_ID_PATTERN % int(lcd_id), body, re.I)
+    doc_id = doc_id_match.group(1).decode() if doc_id_match else f"L{lcd_id}"
+
+    return {
+        "lcd_id": str(lcd_id),
+        "doc_id": doc_id,
+        "title": policy_title.strip(),
+        "url": url,
+        "found_date": found_date
+    }
+
+async def warm_up(session):
+    """Resolve www.cms.gov and open a pooled TLS connection before probing starts."""
+
+    try:
+        async with session.head(CMS_HOME_URL, timeout=aiohttp.ClientTimeout(total=10)):
+            pass
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        print(f"Could not pre-connect to www.cms.gov: {e}")
+
+async def accept_terms(browser):
+    """Click "I Accept" once and return the storage state holding the consent cookie."""
+
+    context = await browser.new_context()
+    page = await context.new_page()
+
+    try:
+        await page.goto(LCD_VIEW_URL.format(KNOWN_WORKING_IDS[0]), wait_until="domcontentloaded", timeout=10000)
+
+        try:
+            accept_button = await page.wait_for_selector("input[value='I Accept']", timeout=2000)
+            if accept_button:
+                await accept_button.click()
+                await page.wait_for_load_state("domcontentloaded")
+        except:
+            pass
+
+        return await context.storage_state()
+
+    except Exception as e:
+        print(f"Could not accept the CMS terms: {e}")
+        return None
+    finally:
+        await context.close()
+
+class LCDProber:
+    """Validates LCD IDs over a shared aiohttp session.
+
+    Every request goes through one rate limiter, and each ID is probed at most
+    once per run. ``on_miss`` is called with IDs that are definitely not LCDs;
+    failed fetches just return None so a later run can retry them.
+    """
+
+    def __init__(self, max_rate=10, on_miss=None):
+        self.rate_limiter = RateLimiter(max_rate)
+        self.on_miss = on_miss
+        self.validations = {}  # lcd_id -> probe task, shared by every pass of this run
+        self.run_timestamp = datetime.now().isoformat()  # found_date shared by this run's policies
+
+        # Browser fallback for pages that are hidden behind the "I Accept" gate;
+        # each page lives in its own context and is reused across probes
+        self.page_pool = None
+
+    async def open_browser(self, browser, session, workers):
+        """Accept the terms once and share the consent with the session and a pool of pages."""
+
+        storage_state = await accept_terms(browser)
+        if storage_state:
+            session.cookie_jar.update_cookies({c['name']: c['value'] for c in storage_state['cookies']})
+
+        self.page_pool = asyncio.Queue()
+        for _ in range(workers):
+            context = await browser.new_context(storage_state=storage_state)
+            page = await context.new_page()
+            await page.route("**/*", block_unneeded_resources)
+            self.page_pool.put_nowait(page)
+
+    def close_browser(self):
+        """Stop handing out browser pages; closing the browser closes them."""
+        self.page_pool = None
+
+    async def fetch(self, session, url, method="GET", headers=None):
+        """Request an LCD page, backing off on rate limits, 5xx and connection errors.
+
+        Returns the (response, body) pair, or None once every attempt has failed.
+        """
+
+        for attempt in range(MAX_ATTEMPTS):
+            await self.rate_limiter.acquire()
+            backoff = (2 ** attempt) + random.random()
+
+            try:
+                async with session.request(method, url, headers=headers, allow_redirects=True,
+                                           timeout=aiohttp.ClientTimeout(total=10)) as response:
+                    if response.status in RETRY_STATUSES:
+                        delay = retry_after_seconds(response.headers) or backoff
+                        if response.status == 429:
+                            self.rate_limiter.pause(delay)
+                        await asyncio.sleep(delay)
+                        continue
+
+                    # Slow everyone down before the server starts refusing requests
+                    if response.headers.get("X-RateLimit-Remaining") == "0":
+                        self.rate_limiter.pause(retry_after_seconds(response.headers) or 1)
+
+                    return response, await response.read()
+
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                await asyncio.sleep(backoff)
+
+        return None
+
+    async def fetch_body(self, session, url):
+        """Download an LCD page, reading just its head first so misses cost one small request.
+
+        Returns the page bytes, b"" for a definite miss, or None if the fetch failed
+        or the head was inconclusive, so a later run retries the ID.
+        """
+
+        fetched = await self.fetch(session, url, headers={"Range": f"bytes=0-{HEAD_BYTES - 1}"})
+        if fetched is None:
+            return None
+        response, body = fetched
+        if response.status in MISS_STATUSES:
+            return b""
+        if response.status not in (200, 206):
+            return None  # refused for some other reason; leave the ID for a later run
+
+        # Only a page that calls itself an error, "not found" or search page is a miss
+        title = head_title(body)
+        if any(word in title for word in REJECT_TITLE_WORDS):
+            return b""
+        if response.status == 200:
+            return body  # the server ignored the range and sent the whole page
+        if title and "LCD" not in title and not ACCEPT_GATE_RE.search(body):
+            return None
+
+        fetched = await self.fetch(session, url)
+        if fetched is None or fetched[0].status != 200:
+            return None
+        return fetched[1]
+
+    def probe(self, session, lcd_id):
+        """Return the policy record for an LCD ID, or None if it isn't a valid policy.
+
+        Memoized per ID, misses included, so overlapping passes and concurrent
+        callers share a single probe.
+        """
+
+        if lcd_id not in self.validations:
+            self.validations[lcd_id] = asyncio.ensure_future(self.probe_uncached(session, lcd_id))
+        return self.validations[lcd_id]
+
+    async def probe_uncached(self, session, lcd_id):
+        """Fetch and parse one LCD ID, reporting it to on_miss only if it is definitely not a policy."""
+
+        body = await self.fetch_body(session, LCD_VIEW_URL.format(lcd_id))
+        if body is None:
+            return None
+        if not body:
+            if self.on_miss is not None:
+                self.on_miss(lcd_id)
+            return None
+
+        # The terms interstitial needs a real click; fall back to the browser
+        if ACCEPT_GATE_RE.search(body) and self.page_pool is not None:
+            page = await self.page_pool.get()
+            try:
+                return await self.probe_in_browser(page, lcd_id)
+            finally:
+                self.page_pool.put_nowait(page)
+
+        # A full page that still doesn't parse is not recorded, so a later run retries it
+        return await asyncio.to_thread(parse_lcd_html, body, lcd_id, self.run_timestamp)
+
+    async def probe_in_browser(self, page, lcd_id):
+        """Validate an LCD ID by rendering it in a context that already accepted the terms."""
+
+        try:
+            url = LCD_VIEW_URL.format(lcd_id)
+            await page.goto(url, wait_until="domcontentloaded", timeout=10000)
+
+            body = (await page.content()).encode("utf-8")
+            return await asyncio.to_thread(parse_lcd_html, body, lcd_id, self.run_timestamp)
+
+        except Exception:
+            pass
+
+        return None